@@ -45,6 +45,15 @@ function setupEventListeners() {
         const email = emailInput.value;
         const password = passwordInput.value;
         
+        if (!email || !password) {
+            authStatus.innerHTML = `
+                <p style="text-align: center; color: red;">
+                    Error: Please enter both email and password
+                </p>
+            `;
+            return;
+        }
+        
         firebase.auth().signInWithEmailAndPassword(email, password)
             .then((userCredential) => {
                 // Signed in
@@ -66,6 +75,24 @@ function setupEventListeners() {
         const email = emailInput.value;
         const password = passwordInput.value;
         
+        if (!email || !password) {
+            authStatus.innerHTML = `
+                <p style="text-align: center; color: red;">
+                    Error: Please enter both email and password
+                </p>
+            `;
+            return;
+        }
+        
+        if (password.length < 6) {
+            authStatus.innerHTML = `
+                <p style="text-align: center; color: red;">
+                    Error: Password should be at least 6 characters
+                </p>
+            `;
+            return;
+        }
+        
         firebase.auth().createUserWithEmailAndPassword(email, password)
             .then((userCredential) => {
                 // Signed up
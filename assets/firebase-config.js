@@ -11,7 +11,17 @@ const firebaseConfig = {
 };
 
 // Initialize Firebase
-firebase.initializeApp(firebaseConfig);
+try {
+    // Check if Firebase is already initialized
+    if (!firebase.apps.length) {
+        firebase.initializeApp(firebaseConfig);
+        console.log("Firebase initialized successfully");
+    } else {
+        console.log("Firebase already initialized");
+    }
+} catch (error) {
+    console.error("Firebase initialization error:", error);
+}
 
 // Initialize Analytics
 const analytics = firebase.analytics(); 
\ No newline at end of file
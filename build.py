@@ -1,20 +1,8 @@
 import os
 import shutil
 
-# Create public directory if it doesn't exist
-if not os.path.exists('public'):
-    os.makedirs('public')
-
-# Copy static assets
-if os.path.exists('assets'):
-    if not os.path.exists('public/assets'):
-        os.makedirs('public/assets')
-    for file in os.listdir('assets'):
-        shutil.copy2(f'assets/{file}', f'public/assets/{file}')
-
-# Create a simple index.html with static content
-with open('public/index.html', 'w') as f:
-    f.write('''
+# A simple index.html with static content, kept as bytes ready to write
+INDEX_HTML = b'''
 <!DOCTYPE html>
 <html>
 <head>
@@ -86,4 +74,44 @@ with open('public/index.html', 'w') as f:
     <p class="note">Your dashboard is now live on Render!</p>
 </body>
 </html>
-    ''') 
\ No newline at end of file
+    '''
+
+# Create public directory if it doesn't exist
+if not os.path.exists('public'):
+    os.makedirs('public')
+
+# Copy static assets
+if os.path.exists('assets'):
+    if not os.path.exists('public/assets'):
+        os.makedirs('public/assets')
+    # scandir entries carry their file type, so no extra stat() per file
+    with os.scandir('assets') as it:
+        entries = [entry for entry in it if entry.is_file()]
+    for entry in entries:
+        target = f'public/assets/{entry.name}'
+        source_stat = entry.stat()
+        
+        # Skip files whose copy is already up to date
+        try:
+            target_stat = os.stat(target)
+            if target_stat.st_size == source_stat.st_size and target_stat.st_mtime >= source_stat.st_mtime:
+                continue
+        except FileNotFoundError:
+            pass
+        
+        # Carry the source mtime over so the next run can skip the file
+        shutil.copyfile(entry.path, target)
+        os.utime(target, (source_stat.st_atime, source_stat.st_mtime))
+
+# Only rewrite index.html when its content changed, so deploys skip it otherwise
+try:
+    with open('public/index.html', 'rb') as f:
+        existing = f.read()
+except FileNotFoundError:
+    existing = b''
+if existing != INDEX_HTML:
+    fd = os.open('public/index.html', os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, INDEX_HTML)
+    finally:
+        os.close(fd)
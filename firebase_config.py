@@ -2,9 +2,8 @@ import firebase_admin
 from firebase_admin import credentials, firestore
 import os
 import json
-import time
+import pandas as pd
 from datetime import datetime
-import shutil
 
 # Firebase configuration
 # In production, use environment variables or secure secret management
@@ -26,69 +25,82 @@ def initialize_firebase():
         print(f"Firebase initialization error: {e}")
         return None
 
-def save_data_to_firebase(db, collection_name, data, max_retries=3, batch_size=50):
+def save_data_to_firebase(db, collection_name, data, max_retries=3):
     """Save data to Firebase Firestore with improved error handling and batching"""
+    return save_collections_to_firebase(db, [(collection_name, data)], max_retries)
+
+def _records(data):
+    """Rows of a DataFrame (or a list of dicts) as dicts, built only as they are consumed"""
+    if isinstance(data, pd.DataFrame):
+        # Series.tolist() gives plain Python values (floats, Timestamps) Firestore can store
+        columns = list(data.columns)
+        values = [data[column].tolist() for column in columns]
+        return (dict(zip(columns, row)) for row in zip(*values))
+    return iter(data or [])
+
+def _writes(collections):
+    """(collection_name, item) for every item of every collection"""
+    for collection_name, data in collections:
+        for item in _records(data):
+            # Add a timestamp field if not present
+            if 'timestamp' not in item and 'date' in item:
+                item['timestamp'] = item['date']
+            yield collection_name, item
+
+# gRPC status codes worth retrying: DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED, UNAVAILABLE
+TRANSIENT_CODES = {4, 8, 10, 14}
+
+def _bulk_write(db, collection_names, writes, max_retries):
+    """Write (collection_name, item) pairs through a BulkWriter, returning how many failed"""
+    failed = []
+    
+    def on_write_error(error, bulk_writer):
+        # Retry transient errors per write instead of resending whole batches
+        if error.code in TRANSIENT_CODES and error.attempts < max_retries:
+            return True
+        print(f"Write failed after {error.attempts} attempts: {error.message}")
+        failed.append(error)
+        return False
+    
+    # Resolve each collection path once rather than per document
+    collection_refs = {name: db.collection(name) for name in collection_names}
+    
+    bulk_writer = db.bulk_writer()
+    bulk_writer.on_write_error(on_write_error)
+    for collection_name, item in writes:
+        bulk_writer.create(collection_refs[collection_name].document(), item)
+    
+    # Closing flushes the remaining writes and waits for them
+    bulk_writer.close()
+    return len(failed)
+
+def save_collections_to_firebase(db, collections, max_retries=3):
+    """Save several (collection_name, data) pairs to Firestore through shared batches"""
+    collection_names = [collection_name for collection_name, _ in collections]
+    names = ", ".join(collection_names)
+    
     if db is None:
-        print("Demo mode: Would save data to Firebase collection:", collection_name)
+        print("Demo mode: Would save data to Firebase collections:", names)
         return False
     
     try:
-        # Convert dataframe to dict if needed
-        if hasattr(data, 'to_dict'):
-            data_dict = data.to_dict(orient='records')
-        else:
-            data_dict = data
-            
-        if not data_dict:
-            print(f"No data to save to {collection_name}")
+        total = sum(len(data) if data is not None else 0 for _, data in collections)
+        if not total:
+            print(f"No data to save to {names}")
             return True
             
-        print(f"Attempting to save {len(data_dict)} items to {collection_name}")
+        print(f"Attempting to save {total} items to {names}")
         
-        # Process in batches to avoid timeouts and rate limits
-        for retry in range(max_retries):
-            try:
-                # Use batched writes for better performance
-                total_batches = (len(data_dict) + batch_size - 1) // batch_size
-                
-                for batch_num in range(total_batches):
-                    start_idx = batch_num * batch_size
-                    end_idx = min(start_idx + batch_size, len(data_dict))
-                    batch_items = data_dict[start_idx:end_idx]
-                    
-                    # Create a batch
-                    batch = db.batch()
-                    
-                    # Add each item to the batch
-                    for item in batch_items:
-                        # Add a timestamp field if not present
-                        if 'timestamp' not in item and 'date' in item:
-                            item['timestamp'] = item['date']
-                            
-                        # Create a reference to a new document
-                        doc_ref = db.collection(collection_name).document()
-                        batch.set(doc_ref, item)
-                    
-                    # Commit the batch
-                    batch.commit()
-                    print(f"Saved batch {batch_num+1}/{total_batches} to {collection_name}")
-                    
-                    # Small delay to avoid rate limiting
-                    if batch_num < total_batches - 1:
-                        time.sleep(0.5)
-                
-                print(f"Successfully saved all data to {collection_name}")
-                return True
-                
-            except Exception as e:
-                print(f"Error on attempt {retry+1}: {e}")
-                if retry < max_retries - 1:
-                    wait_time = (retry + 1) * 2  # Exponential backoff
-                    print(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"Failed after {max_retries} attempts")
-                    return False
+        # BulkWriter ramps up its parallel commits itself (500/50/5) while
+        # staying under Firestore's write limits, and retries failed writes
+        # individually through its error callback
+        failed = _bulk_write(db, collection_names, _writes(collections), max_retries)
+        if failed:
+            print(f"Failed to save {failed}/{total} items to {names}")
+            return False
+        
+        print(f"Successfully saved all data to {names}")
+        return True
                     
     except Exception as e:
         print(f"Error preparing data for Firebase: {e}")
@@ -101,36 +113,9 @@ def get_data_from_firebase(db, collection_name, limit=100):
         return None
     
     try:
-        # Get data from collection with limit
-        docs = db.collection(collection_name).limit(limit).get()
+        # Stream the documents so each one is converted as it arrives
+        docs = db.collection(collection_name).limit(limit).stream()
         return [doc.to_dict() for doc in docs]
     except Exception as e:
         print(f"Error retrieving from Firebase: {e}")
         return None
-
-# Create public directory if it doesn't exist
-if not os.path.exists('public'):
-    os.makedirs('public')
-
-# Copy static assets
-if os.path.exists('assets'):
-    if not os.path.exists('public/assets'):
-        os.makedirs('public/assets')
-    for file in os.listdir('assets'):
-        shutil.copy2(f'assets/{file}', f'public/assets/{file}')
-
-# Create a simple index.html that redirects to the app
-with open('public/index.html', 'w') as f:
-    f.write('''
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>Dash Sensor Dashboard</title>
-    <meta http-equiv="refresh" content="0;URL='https://your-project-id.web.app/_dash-routes/'" />
-</head>
-<body>
-    <p>Redirecting to the dashboard...</p>
-</body>
-</html>
-    '''.replace('your-project-id', 'dashweb-9ec83')) 
\ No newline at end of file
@@ -2,38 +2,67 @@
 Module for interacting with Firebase Cloud Functions
 """
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import os
-import random
+import functools
+import numpy as np
 from datetime import datetime
 
+# Demo statistics: type, value range and sample count range (inclusive) of each
+DEMO_STAT_TYPES = ['temperature_average', 'humidity_average', 'pressure_average', 'prediction_accuracy']
+DEMO_VALUE_LOW = [20, 40, 1000, 75]
+DEMO_VALUE_HIGH = [25, 60, 1020, 95]
+DEMO_SAMPLES_LOW = [100, 100, 100, 50]
+DEMO_SAMPLES_HIGH = [500, 500, 500, 200]
+
+_rng = np.random.default_rng()
+
+@functools.lru_cache(maxsize=1)
+def _load_project_id():
+    """Project ID from serviceAccountKey.json, read once per process; returns (project_id, demo_mode)"""
+    try:
+        if os.path.exists('serviceAccountKey.json'):
+            with open('serviceAccountKey.json', 'rb') as f:
+                service_account = orjson.loads(f.read())
+                return service_account.get('project_id'), False
+        else:
+            print("ServiceAccountKey.json not found. Using demo mode for Cloud Functions.")
+            return None, True
+    except Exception as e:
+        print(f"Error getting project ID: {e}")
+        return None, True
+
+@functools.lru_cache(maxsize=32)
+def _build_url(region, project_id, function_name):
+    """URL of a Cloud Function"""
+    return f"https://{region}-{project_id}.cloudfunctions.net/{function_name}"
+
 class FirebaseFunctions:
     """Interface for Firebase Cloud Functions"""
     
     def __init__(self):
         # Get the project ID from serviceAccountKey.json if available
-        self.project_id = None
+        self.project_id, self.demo_mode = _load_project_id()
         self.region = "us-central1"  # Default region
-        self.demo_mode = False
         
-        try:
-            if os.path.exists('serviceAccountKey.json'):
-                with open('serviceAccountKey.json', 'r') as f:
-                    service_account = json.load(f)
-                    self.project_id = service_account.get('project_id')
-            else:
-                self.demo_mode = True
-                print("ServiceAccountKey.json not found. Using demo mode for Cloud Functions.")
-        except Exception as e:
-            self.demo_mode = True
-            print(f"Error getting project ID: {e}")
+        # Reuse one connection (and TLS session) across calls
+        self.session = requests.Session()
+        self.session.headers.update({'Accept': 'application/json'})
+        
+        # Keep a small pool of connections alive and retry transient server
+        # errors with backoff; non-2xx responses still reach the callers
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                      raise_on_status=False)
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
     
     def get_function_url(self, function_name):
         """Get the URL for a specific function"""
         if not self.project_id:
             return None
             
-        return f"https://{self.region}-{self.project_id}.cloudfunctions.net/{function_name}"
+        return _build_url(self.region, self.project_id, function_name)
     
     def get_stats(self):
         """Call the getStats function to retrieve latest statistics"""
@@ -48,10 +77,10 @@ class FirebaseFunctions:
             return self._generate_demo_stats()
             
         try:
-            response = requests.get(function_url, timeout=10)
+            response = self.session.get(function_url, timeout=10)
             
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 print(f"Error calling getStats: {response.status_code} - {response.text}")
                 return self._generate_demo_stats()
@@ -74,13 +103,13 @@ class FirebaseFunctions:
             
         try:
             if data:
-                response = requests.post(function_url, json=data, timeout=10)
+                response = self.session.post(function_url, json=data, timeout=10)
             else:
-                response = requests.get(function_url, timeout=10)
+                response = self.session.get(function_url, timeout=10)
                 
             if response.status_code in (200, 201, 204):
                 try:
-                    return response.json()
+                    return orjson.loads(response.content)
                 except:
                     return {"success": True, "status_code": response.status_code}
             else:
@@ -95,33 +124,15 @@ class FirebaseFunctions:
         """Generate demo statistics data for testing"""
         current_timestamp = {"_seconds": int(datetime.now().timestamp()), "_nanoseconds": 0}
         
+        # Draw every value and sample count in two calls
+        values = _rng.uniform(DEMO_VALUE_LOW, DEMO_VALUE_HIGH).round(2).tolist()
+        samples = _rng.integers(DEMO_SAMPLES_LOW, DEMO_SAMPLES_HIGH, endpoint=True).tolist()
+        
         demo_stats = {
             "stats": [
-                {
-                    "type": "temperature_average",
-                    "value": round(random.uniform(20, 25), 2),
-                    "samples": random.randint(100, 500),
-                    "timestamp": current_timestamp
-                },
-                {
-                    "type": "humidity_average",
-                    "value": round(random.uniform(40, 60), 2),
-                    "samples": random.randint(100, 500),
-                    "timestamp": current_timestamp
-                },
-                {
-                    "type": "pressure_average",
-                    "value": round(random.uniform(1000, 1020), 2),
-                    "samples": random.randint(100, 500),
-                    "timestamp": current_timestamp
-                },
-                {
-                    "type": "prediction_accuracy",
-                    "value": round(random.uniform(75, 95), 2),
-                    "samples": random.randint(50, 200),
-                    "timestamp": current_timestamp
-                }
+                {"type": stat_type, "value": value, "samples": sample_count, "timestamp": current_timestamp}
+                for stat_type, value, sample_count in zip(DEMO_STAT_TYPES, values, samples)
             ]
         }
         
-        return demo_stats 
\ No newline at end of file
+        return demo_stats
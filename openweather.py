@@ -1,10 +1,44 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import numpy as np
 import os
 import json
-from datetime import datetime, timedelta
+import orjson
+from datetime import datetime
 import time
+import concurrent.futures
+from stats_kernels import heat_index
+
+# How long API responses are reused (seconds); OpenWeatherMap itself only
+# refreshes current conditions every ~10 minutes
+CURRENT_WEATHER_TTL = 600
+FORECAST_TTL = 1800
+
+# Readings carry at most a few significant digits, so float32 halves their
+# memory; they stay floating point because forecasts can miss a field
+WEATHER_DTYPES = {'temperature': np.float32, 'humidity': np.float32, 'pressure': np.float32}
+
+# Comfort level names, in the order the thresholds are checked
+COMFORT_LEVELS = ["Cold", "Cool", "Comfortable", "Slightly Humid", "Warm", "Humid", "Very Humid", "Hot", "Very Hot"]
+
+def _comfort_codes(t, h):
+    """Index into COMFORT_LEVELS for each temperature/humidity pair; the first matching condition wins"""
+    conditions = [
+        t < 15,
+        t < 21,
+        (t < 26) & (h < 60),
+        t < 26,
+        (t < 30) & (h < 50),
+        (t < 30) & (h < 70),
+        t < 30,
+        h < 50,
+    ]
+    return np.select(conditions, range(len(conditions)), default=len(conditions))
+
+# Comfort level code per whole degree (0-59 °C) and 10% humidity band (0-100%)
+COMFORT_LUT = _comfort_codes(*np.meshgrid(np.arange(60), np.arange(11) * 10, indexing='ij')).astype(np.int8)
 
 class OpenWeatherDataManager:
     """Manager for fetching and processing weather data from OpenWeatherMap API"""
@@ -19,40 +53,77 @@ class OpenWeatherDataManager:
         self.current_weather_url = "https://api.openweathermap.org/data/2.5/weather"
         self.forecast_url = "https://api.openweathermap.org/data/2.5/forecast"
         
-    def get_current_weather(self):
-        """Get current weather data from OpenWeatherMap API"""
+        # (endpoint, location, units, ...) -> (expiry, response json)
+        self._cache = {}
+        
+        # Reuse connections (keep-alive) across API calls and retry transient
+        # server errors with backoff
+        self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      raise_on_status=False)
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+        
+    def close(self):
+        """Close the pooled HTTP connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        
+    def _cached_response(self, key):
+        """Cached response for key if it has not expired yet, else None"""
+        entry = self._cache.get(key)
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+        return None
+    
+    def invalidate(self):
+        """Drop every cached API response"""
+        self._cache.clear()
+        
+    def _get_json(self, url, params, key, ttl, name):
+        """Parsed JSON response for an API request, served from the cache for ttl seconds; None on failure"""
         if not self.api_key:
             print("API key not provided. Set it in the constructor or OPENWEATHERMAP_API_KEY environment variable.")
             return None
             
-        # Parameters for the API request
-        params = {
-            "q": self.location,
-            "appid": self.api_key,
-            "units": "metric"  # For temperature in Celsius
-        }
+        cached = self._cached_response(key)
+        if cached is not None:
+            return cached
         
         try:
             # Make API request
-            response = requests.get(self.current_weather_url, params=params)
+            response = self.session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"Error: API request failed with status code {response.status_code}")
-                print(f"Message: {response.text}")
-                return None
+                data = orjson.loads(response.content)
+                self._cache[key] = (time.monotonic() + ttl, data)
+                return data
+            
+            print(f"Error: {name.capitalize()} API request failed with status code {response.status_code}")
+            print(f"Message: {response.text}")
+            return None
                 
         except Exception as e:
-            print(f"Error fetching current weather data: {e}")
+            print(f"Error fetching {name} data: {e}")
             return None
+        
+    def get_current_weather(self):
+        """Get current weather data from OpenWeatherMap API"""
+        # Parameters for the API request
+        params = {
+            "q": self.location,
+            "appid": self.api_key,
+            "units": "metric"  # For temperature in Celsius
+        }
+        return self._get_json(self.current_weather_url, params, ('weather', self.location, 'metric'),
+                              CURRENT_WEATHER_TTL, "current weather")
     
     def get_forecast(self, days=5):
         """Get 5-day forecast with 3-hour intervals (maximum for free tier)"""
-        if not self.api_key:
-            print("API key not provided. Set it in the constructor or OPENWEATHERMAP_API_KEY environment variable.")
-            return None
-            
         # Parameters for the API request
         params = {
             "q": self.location,
@@ -60,21 +131,8 @@ class OpenWeatherDataManager:
             "units": "metric",  # For temperature in Celsius
             "cnt": min(days * 8, 40)  # Maximum 40 timestamps (5 days with 3-hour intervals)
         }
-        
-        try:
-            # Make API request
-            response = requests.get(self.forecast_url, params=params)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"Error: Forecast API request failed with status code {response.status_code}")
-                print(f"Message: {response.text}")
-                return None
-                
-        except Exception as e:
-            print(f"Error fetching forecast data: {e}")
-            return None
+        return self._get_json(self.forecast_url, params, ('forecast', self.location, 'metric', params['cnt']),
+                              FORECAST_TTL, "forecast")
     
     def get_historical_data(self, days=7, simulated=True):
         """
@@ -110,96 +168,72 @@ class OpenWeatherDataManager:
         print(f"Humidity: {current_humidity}%")
         print(f"Pressure: {current_pressure} hPa")
         
-        # Create a more realistic dataset with seasonal patterns and trends
-        dates = []
-        temps = []
-        humidities = []
-        pressures = []
+        # Create a more realistic dataset with seasonal patterns and trends,
+        # one day per row working backwards from today (oldest first)
+        dates = pd.Timestamp(datetime.now()) - pd.to_timedelta(np.arange(days - 1, -1, -1), unit='D')
         
-        # Generate simulated historical data based on current values
-        np.random.seed(42)  # For reproducibility
+        # Add some random variation with a touch of seasonality
+        seasonal_factor = 2 * np.sin(2 * np.pi * dates.dayofyear.to_numpy() / 365)
         
-        for i in range(days):
-            # Work backwards from today
-            date = datetime.now() - timedelta(days=i)
-            dates.append(date)
-            
-            # Add some random variation with a touch of seasonality
-            day_of_year = date.timetuple().tm_yday
-            seasonal_factor = 2 * np.sin(2 * np.pi * day_of_year / 365)
-            
-            temp_variation = seasonal_factor + np.random.normal(0, 2)
-            humidity_variation = -0.5 * seasonal_factor + np.random.normal(0, 5)
-            pressure_variation = np.random.normal(0, 2)
-            
-            temps.append(current_temp + temp_variation)
-            humidities.append(max(min(current_humidity + humidity_variation, 100), 0))
-            pressures.append(current_pressure + pressure_variation)
+        # Generate simulated historical data based on current values
+        rng = np.random.default_rng(42)  # For reproducibility
+        temps = current_temp + seasonal_factor + rng.normal(0, 2, days)
+        humidities = np.clip(current_humidity - 0.5 * seasonal_factor + rng.normal(0, 5, days), 0, 100)
+        pressures = current_pressure + rng.normal(0, 2, days)
         
         # Create a DataFrame with the data
         df = pd.DataFrame({
             'date': dates,
-            'temperature': temps,
-            'humidity': humidities,
-            'pressure': pressures,
-            'location': city_name
-        })
-        
-        # Sort by date (oldest first)
-        df = df.sort_values('date')
+            'temperature': temps.astype(np.float32),
+            'humidity': humidities.astype(np.float32),
+            'pressure': pressures.astype(np.float32),
+            'location': city_name,
+            'forecast': np.zeros(days, dtype=bool)  # Observed, not forecast data
+        }, copy=False)
         
         return df
     
     def get_complete_weather_data(self, historical_days=30, include_forecast=True):
         """Get a complete dataset with historical and forecast data if available"""
-        # Get historical data (simulated or real)
-        historical_df = self.get_historical_data(days=historical_days)
+        # Request the forecast in the background while the historical data
+        # (which needs the current weather) is fetched, so the two calls overlap
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            forecast_future = executor.submit(self.get_forecast) if include_forecast else None
+            
+            # Get historical data (simulated or real)
+            historical_df = self.get_historical_data(days=historical_days)
+            forecast_data = forecast_future.result() if forecast_future else None
         
         if historical_df is None:
             return None
             
         if include_forecast:
-            # Get forecast data
-            forecast_data = self.get_forecast()
-            
             if forecast_data:
                 forecast_list = forecast_data.get('list', [])
                 city_name = forecast_data.get('city', {}).get('name', self.location)
                 
-                # Extract forecast data
-                forecast_dates = []
-                forecast_temps = []
-                forecast_humidities = []
-                forecast_pressures = []
-                
-                for item in forecast_list:
-                    # Convert timestamp to datetime
-                    timestamp = item.get('dt')
-                    forecast_date = datetime.fromtimestamp(timestamp)
-                    
-                    main_data = item.get('main', {})
-                    
-                    forecast_dates.append(forecast_date)
-                    forecast_temps.append(main_data.get('temp'))
-                    forecast_humidities.append(main_data.get('humidity'))
-                    forecast_pressures.append(main_data.get('pressure'))
+                # Build the forecast DataFrame from just the fields we read,
+                # one tuple per entry
+                rows = [(item.get('dt'), main.get('temp'), main.get('humidity'), main.get('pressure'))
+                        for item in forecast_list
+                        for main in (item.get('main', {}),)]
+                forecast_df = pd.DataFrame(
+                    rows, columns=['date', 'temperature', 'humidity', 'pressure']
+                ).astype(WEATHER_DTYPES)
                 
-                # Create forecast DataFrame
-                forecast_df = pd.DataFrame({
-                    'date': forecast_dates,
-                    'temperature': forecast_temps,
-                    'humidity': forecast_humidities,
-                    'pressure': forecast_pressures,
-                    'location': city_name,
-                    'forecast': True  # Flag to indicate this is forecast data
-                })
+                # Convert timestamps to local datetimes, like the historical data
+                forecast_df['date'] = (pd.to_datetime(forecast_df['date'], unit='s', utc=True)
+                                       .dt.tz_convert(datetime.now().astimezone().tzinfo)
+                                       .dt.tz_localize(None))
+                forecast_df['location'] = city_name
+                forecast_df['forecast'] = True  # Flag to indicate this is forecast data
                 
-                # Add forecast flag to historical data
-                historical_df['forecast'] = False
-                
-                # Combine historical and forecast data
-                combined_df = pd.concat([historical_df, forecast_df], ignore_index=True)
-                combined_df = combined_df.sort_values('date')
+                # Combine historical and forecast data; both are already in date
+                # order and the forecast starts after today, so a sort is only
+                # needed if the two ranges overlap
+                combined_df = pd.concat([historical_df, forecast_df], ignore_index=True, copy=False)
+                if not combined_df['date'].is_monotonic_increasing:
+                    combined_df = combined_df.sort_values('date')
                 
                 return combined_df
         
@@ -207,7 +241,7 @@ class OpenWeatherDataManager:
         return historical_df
     
     def save_data_to_file(self, df, file_path=None):
-        """Save weather data to a CSV file"""
+        """Save weather data to a CSV file, or a Parquet file if the path ends in .parquet"""
         if df is None:
             print("No data to save")
             return False
@@ -216,7 +250,12 @@ class OpenWeatherDataManager:
             file_path = self.data_file
             
         try:
-            df.to_csv(file_path, index=False)
+            # Parquet is binary and compressed, far cheaper to write and read
+            # back than formatting every value as text
+            if file_path.endswith('.parquet'):
+                df.to_parquet(file_path, index=False, compression='zstd')
+            else:
+                df.to_csv(file_path, index=False)
             print(f"Data saved to {file_path}")
             return True
         except Exception as e:
@@ -233,53 +272,21 @@ class OpenWeatherDataManager:
             print("DataFrame missing required columns")
             return df
 
+        t = df[temp_col].to_numpy(dtype=float)
+        h = df[humidity_col].to_numpy(dtype=float)
+
         # Calculate heat index (perceived temperature)
         # Using a simplified formula based on US National Weather Service
-        def heat_index(t, h):
-            if t < 26:  # Only relevant for high temperatures
-                return t
-            
-            # Constants for the heat index calculation
-            c1 = -8.78469475556
-            c2 = 1.61139411
-            c3 = 2.33854883889
-            c4 = -0.14611605
-            c5 = -0.012308094
-            c6 = -0.0164248277778
-            c7 = 0.002211732
-            c8 = 0.00072546
-            c9 = -0.000003582
-            
-            hi = (c1 + c2*t + c3*h + c4*t*h + c5*t**2 + c6*h**2 + c7*t**2*h + c8*t*h**2 + c9*t**2*h**2)
-            return round(hi, 1)
-        
-        # Define comfort levels based on temperature and humidity
-        def comfort_level(t, h):
-            if t < 15:
-                return "Cold"
-            elif t < 21:
-                return "Cool"
-            elif t < 26:
-                if h < 60:
-                    return "Comfortable"
-                else:
-                    return "Slightly Humid"
-            elif t < 30:
-                if h < 50:
-                    return "Warm"
-                elif h < 70:
-                    return "Humid"
-                else:
-                    return "Very Humid"
-            else:
-                if h < 50:
-                    return "Hot"
-                else:
-                    return "Very Hot"
+        df['heat_index'] = heat_index(t, h)
         
-        # Add new columns
-        df['heat_index'] = df.apply(lambda row: heat_index(row[temp_col], row[humidity_col]), axis=1)
-        df['comfort_level'] = df.apply(lambda row: comfort_level(row[temp_col], row[humidity_col]), axis=1)
+        # Define comfort levels based on temperature and humidity, looked up
+        # per whole degree and 10% humidity band (every threshold sits on a
+        # band edge). Missing readings land in the last band, where none of
+        # the threshold comparisons would have matched
+        t_band = np.clip(np.floor(np.nan_to_num(t, nan=COMFORT_LUT.shape[0] - 1)), 0, COMFORT_LUT.shape[0] - 1)
+        h_band = np.clip(np.floor(np.nan_to_num(h, nan=100) / 10), 0, COMFORT_LUT.shape[1] - 1)
+        df['comfort_level'] = pd.Categorical.from_codes(
+            COMFORT_LUT[t_band.astype(np.intp), h_band.astype(np.intp)], categories=COMFORT_LEVELS)
         
         return df
 
@@ -1,10 +1,53 @@
 import pandas as pd
 import numpy as np
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import os
 from datetime import datetime, timedelta
 import time
+from functools import lru_cache
+
+# Seconds a generated simulated dataset is reused before it is rebuilt
+SIMULATED_DATA_TTL = 600
+
+@lru_cache(maxsize=4)
+def _simulated_data(days, bucket):
+    """Simulated sensor data for days ending now, cached per SIMULATED_DATA_TTL bucket"""
+    # Create a more realistic dataset with seasonal patterns and trends, one
+    # row per whole day so every process regenerates the same window all day
+    dates = pd.date_range(end=pd.Timestamp.now().normalize(), periods=days, freq='D')
+    
+    # Create seasonal components (annual cycle)
+    day_of_year = dates.dayofyear.to_numpy()
+    annual_cycle = 10 * np.sin((2 * np.pi / 365) * day_of_year)
+    
+    # Random generator seeded for reproducibility
+    rng = np.random.default_rng(42)
+    
+    # Base values with seasonal variations and some noise
+    temperature = 25 + annual_cycle + rng.normal(0, 3, days)
+    humidity = 60 + (-5 * annual_cycle) + rng.normal(0, 5, days)
+    pressure = 1013 + rng.normal(0, 3, days)
+    
+    # Add some correlation between variables
+    humidity += 0.2 * temperature
+    
+    # Add a small number of anomalies (10% probability)
+    anomaly_mask = rng.random(days) < 0.1
+    temperature[anomaly_mask] += rng.choice([-10, 10], size=anomaly_mask.sum())
+    
+    # Create DataFrame from one column-major array, so the readings share a
+    # single contiguous block
+    values = np.empty((days, 3), dtype=np.float32, order='F')
+    values[:, 0] = temperature
+    values[:, 1] = humidity
+    values[:, 2] = pressure
+    df = pd.DataFrame(values, columns=['temperature', 'humidity', 'pressure'], copy=False)
+    df.insert(0, 'date', dates)
+    
+    return df
 
 class SensorDataManager:
     """Manager for handling sensor data from various sources"""
@@ -16,62 +59,86 @@ class SensorDataManager:
         self.api_key = os.environ.get("SENSOR_API_KEY", "")
         self.data_file = os.environ.get("SENSOR_DATA_FILE", "sensor_data.csv")
         
-    def get_sensor_data(self, days=100):
-        """Get sensor data from the configured source"""
+        # Reuse connections (keep-alive) across API calls and retry transient
+        # server errors with backoff
+        self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      raise_on_status=False)
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+        
+    def close(self):
+        """Close the pooled HTTP connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        
+    def get_sensor_data(self, days=100, fallback=True):
+        """Get sensor data from the configured source
+        
+        With fallback=False a failing API or file source returns an empty
+        frame instead of simulated data.
+        """
         if self.data_source == "simulated":
-            return self._generate_simulated_data(days)
+            df = self._generate_simulated_data(days)
         elif self.data_source == "api":
-            return self._fetch_api_data(days)
+            df = self._fetch_api_data(days, fallback)
         elif self.data_source == "file":
-            return self._read_file_data()
+            df = self._read_file_data(fallback)
         else:
             # Default to simulated data if unknown source
-            return self._generate_simulated_data(days)
+            df = self._generate_simulated_data(days)
+            
+        # float32 is plenty for these readings and halves the bytes every
+        # downstream slice, copy and plot has to move; columns that already
+        # are float32 are left alone so their shared block stays intact
+        for col in ['temperature', 'humidity', 'pressure']:
+            if col in df.columns and df[col].dtype != np.float32:
+                df[col] = df[col].astype(np.float32, copy=False)
+                
+        return df
+            
+    def get_sensor_data_since(self, last_date, days=100):
+        """Get only the records newer than last_date from the configured source"""
+        # Only the days since the last record need fetching, capped at the full window
+        last_date = pd.Timestamp(last_date)
+        gap_days = min(days, (pd.Timestamp.now(tz=last_date.tz) - last_date).days + 1)
+        # Simulated rows must never be appended to real ones, so a failing
+        # source comes back empty and the current data stands
+        df = self.get_sensor_data(days=gap_days, fallback=False)
+        return df[df['date'] > last_date].reset_index(drop=True)
             
     def _generate_simulated_data(self, days=100):
         """Generate simulated sensor data"""
-        # Create a more realistic dataset with seasonal patterns and trends
-        dates = pd.date_range(end=datetime.now(), periods=days, freq='D')
-        
-        # Create seasonal components (annual cycle)
-        day_of_year = np.array([d.dayofyear for d in dates])
-        annual_cycle = 10 * np.sin(2 * np.pi * day_of_year / 365)
-        
-        # Random seed for reproducibility
-        np.random.seed(42)
-        
-        # Base values with seasonal variations and some noise
-        temperature = 25 + annual_cycle + np.random.normal(0, 3, days)
-        humidity = 60 + (-5 * annual_cycle) + np.random.normal(0, 5, days)
-        pressure = 1013 + np.random.normal(0, 3, days)
-        
-        # Add some correlation between variables
-        humidity += 0.2 * temperature
-        
-        # Create DataFrame
-        df = pd.DataFrame({
-            'date': dates,
-            'temperature': temperature,
-            'humidity': humidity,
-            'pressure': pressure,
-        })
-        
-        # Add a small number of anomalies (10% probability)
-        anomaly_mask = np.random.random(days) < 0.1
-        df.loc[anomaly_mask, 'temperature'] += np.random.choice([-10, 10], size=sum(anomaly_mask))
-        
-        return df
+        # The API and file sources fall back to this on every failure, so the
+        # frame is built once per window and callers get their own copy
+        return _simulated_data(days, int(time.time() // SIMULATED_DATA_TTL)).copy()
+    
+    def _fallback_data(self, days, fallback):
+        """Simulated data in place of a failed source, or an empty frame without fallback"""
+        if fallback:
+            print("Using simulated data.")
+            return self._generate_simulated_data(days)
+        return pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'),
+                             'temperature': pd.Series(dtype=np.float32),
+                             'humidity': pd.Series(dtype=np.float32),
+                             'pressure': pd.Series(dtype=np.float32)})
     
-    def _fetch_api_data(self, days=100):
+    def _fetch_api_data(self, days=100, fallback=True):
         """Fetch data from an API endpoint"""
         if not self.api_endpoint or not self.api_key:
-            print("API endpoint or key not configured. Using simulated data.")
-            return self._generate_simulated_data(days)
+            print("API endpoint or key not configured.")
+            return self._fallback_data(days, fallback)
             
         try:
             # Calculate the start date for the request
-            end_date = datetime.now().strftime("%Y-%m-%d")
-            start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+            # (one clock read, so both ends agree even across midnight)
+            now = datetime.now()
+            end_date = now.strftime("%Y-%m-%d")
+            start_date = (now - timedelta(days=days)).strftime("%Y-%m-%d")
             
             # Make the API request
             params = {
@@ -81,54 +148,64 @@ class SensorDataManager:
                 "metrics": "temperature,humidity,pressure"
             }
             
-            response = requests.get(self.api_endpoint, params=params)
+            response = self.session.get(self.api_endpoint, params=params)
             
             if response.status_code == 200:
                 # Assume the API returns JSON with a data array
-                data = response.json().get("data", [])
+                data = orjson.loads(response.content).get("data", [])
                 
                 if data:
                     # Convert to DataFrame
                     df = pd.DataFrame(data)
                     
-                    # Ensure date column is datetime
-                    df['date'] = pd.to_datetime(df['date'])
+                    # Ensure date column is datetime; timestamps with an offset
+                    # are converted to naive UTC so they compare with naive dates
+                    df['date'] = pd.to_datetime(df['date'], utc=True).dt.tz_localize(None)
                     
                     return df
                     
             # If we get here, the API request failed or returned no data
-            print(f"API request failed with status {response.status_code}. Using simulated data.")
-            return self._generate_simulated_data(days)
+            print(f"API request failed with status {response.status_code}.")
+            return self._fallback_data(days, fallback)
             
         except Exception as e:
-            print(f"Error fetching API data: {e}. Using simulated data.")
-            return self._generate_simulated_data(days)
+            print(f"Error fetching API data: {e}.")
+            return self._fallback_data(days, fallback)
     
-    def _read_file_data(self):
+    def _read_file_data(self, fallback=True):
         """Read sensor data from a file"""
         try:
-            if os.path.exists(self.data_file):
-                df = pd.read_csv(self.data_file)
-                
-                # Ensure date column is datetime
-                df['date'] = pd.to_datetime(df['date'])
+            if os.path.exists(self.data_file) and self.data_file.endswith('.parquet'):
+                # Parquet keeps the column types, so no parsing is needed
+                return pd.read_parquet(self.data_file)
+            elif os.path.exists(self.data_file):
+                # Explicit dtypes skip type inference and dates are parsed
+                # while reading (repeated values converted once)
+                df = pd.read_csv(self.data_file, engine='c',
+                                 dtype={'temperature': np.float32, 'humidity': np.float32, 'pressure': np.float32},
+                                 parse_dates=['date'], cache_dates=True)
                 
                 return df
             else:
-                print(f"Data file {self.data_file} not found. Using simulated data.")
-                return self._generate_simulated_data()
+                print(f"Data file {self.data_file} not found.")
+                return self._fallback_data(100, fallback)
                 
         except Exception as e:
-            print(f"Error reading file data: {e}. Using simulated data.")
-            return self._generate_simulated_data()
+            print(f"Error reading file data: {e}.")
+            return self._fallback_data(100, fallback)
     
     def save_data_to_file(self, df, file_path=None):
-        """Save sensor data to a CSV file"""
+        """Save sensor data to a CSV file, or a Parquet file if the path ends in .parquet"""
         if file_path is None:
             file_path = self.data_file
             
         try:
-            df.to_csv(file_path, index=False)
+            # Parquet is binary and compressed, far cheaper to write and read
+            # back than formatting every value as text
+            if file_path.endswith('.parquet'):
+                df.to_parquet(file_path, index=False, compression='zstd')
+            else:
+                df.to_csv(file_path, index=False)
             print(f"Data saved to {file_path}")
             return True
         except Exception as e:
@@ -1,10 +1,72 @@
 import pandas as pd
 import numpy as np
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import hashlib
 import os
 from datetime import datetime, timedelta
 import time
+import concurrent.futures
+from functools import lru_cache
+
+# API responses are kept on disk for this many seconds: current weather changes
+# hourly, daily history rarely changes within a day, sensor feeds update often
+CURRENT_WEATHER_TTL = 3600
+HISTORY_TTL = 24 * 3600
+FEED_TTL = 600
+
+# Days of ThingSpeak history requested per call when backfilling long windows
+THINGSPEAK_SHARD_DAYS = 30
+
+# Seconds a generated simulated dataset is reused before it is rebuilt
+SIMULATED_DATA_TTL = 600
+
+def _to_float(value):
+    """value as a float, or NaN if it is missing or not a number"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+@lru_cache(maxsize=4)
+def _simulated_data(days, bucket):
+    """Simulated sensor data for days ending now, cached per SIMULATED_DATA_TTL bucket"""
+    # Create a more realistic dataset with seasonal patterns and trends, one
+    # row per whole day so a cached frame's dates don't depend on when it was built
+    dates = pd.date_range(end=pd.Timestamp.now().normalize(), periods=days, freq='D')
+    
+    # Create seasonal components (annual cycle)
+    day_of_year = dates.dayofyear.to_numpy()
+    annual_cycle = 10 * np.sin((2 * np.pi / 365) * day_of_year)
+    
+    # Random generator seeded for reproducibility (no global state)
+    rng = np.random.default_rng(42)
+    
+    # Base values with seasonal variations and some noise
+    temperature = 25 + annual_cycle + rng.normal(0, 3, days)
+    humidity = 60 + (-5 * annual_cycle) + rng.normal(0, 5, days)
+    pressure = 1013 + rng.normal(0, 3, days)
+    
+    # Add some correlation between variables
+    humidity += 0.2 * temperature
+    
+    # Add a small number of anomalies (10% probability), on the array before
+    # the DataFrame exists
+    anomaly_mask = rng.random(days) < 0.1
+    temperature[anomaly_mask] += rng.choice([-10, 10], size=anomaly_mask.sum())
+    
+    # Create DataFrame from one column-major float32 array, so the readings
+    # share a single contiguous block at half the size of float64
+    values = np.empty((days, 3), dtype=np.float32, order='F')
+    values[:, 0] = temperature
+    values[:, 1] = humidity
+    values[:, 2] = pressure
+    df = pd.DataFrame(values, columns=['temperature', 'humidity', 'pressure'], copy=False)
+    df.insert(0, 'date', dates)
+    
+    return df
 
 class SensorDataManager:
     """Manager for handling sensor data from various sources"""
@@ -21,6 +83,52 @@ class SensorDataManager:
         # File configuration
         self.data_file = os.environ.get("SENSOR_DATA_FILE", "sensor_data.csv")
         
+        # Directory for cached API responses
+        self.cache_dir = os.environ.get("SENSOR_CACHE_DIR", ".sensor_cache")
+        
+        # Reuse connections (keep-alive) across API calls and retry transient
+        # server errors with backoff
+        self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      raise_on_status=False)
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+        
+    def close(self):
+        """Close the pooled HTTP connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        
+    def _cached_get(self, url, params, ttl):
+        """(JSON data, None) for a GET, read from the disk cache if younger than ttl seconds; (None, response) on failure"""
+        key = hashlib.sha256(orjson.dumps({'u': url, 'p': params}, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        
+        try:
+            if os.path.getmtime(path) > time.time() - ttl:
+                with open(path, 'rb') as f:
+                    return orjson.loads(f.read()), None
+        except (OSError, ValueError):
+            pass  # Missing, stale or unreadable entry; fetch it again
+        
+        response = self.session.get(url, params=params, timeout=10)
+        if response.status_code != 200:
+            return None, response
+        
+        data = orjson.loads(response.content)
+        
+        # Write to a temporary file first so readers never see a partial entry
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(response.content)
+        os.replace(tmp_path, path)
+        return data, None
+        
     def get_sensor_data(self, days=100):
         """Get sensor data from the configured source"""
         if self.data_source == "simulated":
@@ -40,37 +148,9 @@ class SensorDataManager:
             
     def _generate_simulated_data(self, days=100):
         """Generate simulated sensor data"""
-        # Create a more realistic dataset with seasonal patterns and trends
-        dates = pd.date_range(end=datetime.now(), periods=days, freq='D')
-        
-        # Create seasonal components (annual cycle)
-        day_of_year = np.array([d.dayofyear for d in dates])
-        annual_cycle = 10 * np.sin(2 * np.pi * day_of_year / 365)
-        
-        # Random seed for reproducibility
-        np.random.seed(42)
-        
-        # Base values with seasonal variations and some noise
-        temperature = 25 + annual_cycle + np.random.normal(0, 3, days)
-        humidity = 60 + (-5 * annual_cycle) + np.random.normal(0, 5, days)
-        pressure = 1013 + np.random.normal(0, 3, days)
-        
-        # Add some correlation between variables
-        humidity += 0.2 * temperature
-        
-        # Create DataFrame
-        df = pd.DataFrame({
-            'date': dates,
-            'temperature': temperature,
-            'humidity': humidity,
-            'pressure': pressure,
-        })
-        
-        # Add a small number of anomalies (10% probability)
-        anomaly_mask = np.random.random(days) < 0.1
-        df.loc[anomaly_mask, 'temperature'] += np.random.choice([-10, 10], size=sum(anomaly_mask))
-        
-        return df
+        # The seed is fixed, so the frame only changes with days and the date;
+        # build it once per window and give callers their own copy
+        return _simulated_data(days, int(time.time() // SIMULATED_DATA_TTL)).copy()
     
     def _fetch_api_data(self, days=100):
         """Fetch data from an API endpoint"""
@@ -109,11 +189,9 @@ class SensorDataManager:
         }
         
         # Make API request
-        response = requests.get(base_url, params=params)
+        data, response = self._cached_get(base_url, params, CURRENT_WEATHER_TTL)
         
-        if response.status_code == 200:
-            data = response.json()
-            
+        if data is not None:
             # Extract relevant data
             current_temp = data['main']['temp']
             current_humidity = data['main']['humidity']
@@ -127,36 +205,22 @@ class SensorDataManager:
             # For demo purposes, create a series of historical data
             # In a production app, you'd use the historical API (paid tier)
             
-            dates = []
-            temps = []
-            humidities = []
-            pressures = []
+            # One day per row working backwards from today (oldest first)
+            dates = pd.Timestamp(datetime.now()) - pd.to_timedelta(np.arange(days - 1, -1, -1), unit='D')
             
-            for i in range(days):
-                # Work backwards from today
-                date = datetime.now() - timedelta(days=i)
-                dates.append(date)
-                
-                # Add some random variation to create simulated historical data
-                import random
-                temp_variation = random.uniform(-3, 3)
-                humidity_variation = random.uniform(-10, 10)
-                pressure_variation = random.uniform(-5, 5)
-                
-                temps.append(current_temp + temp_variation)
-                humidities.append(max(min(current_humidity + humidity_variation, 100), 0))
-                pressures.append(current_pressure + pressure_variation)
+            # Add some random variation to create simulated historical data
+            rng = np.random.default_rng()
+            temps = current_temp + rng.uniform(-3, 3, days)
+            humidities = np.clip(current_humidity + rng.uniform(-10, 10, days), 0, 100)
+            pressures = current_pressure + rng.uniform(-5, 5, days)
             
             # Create a DataFrame with the data
             df = pd.DataFrame({
                 'date': dates,
-                'temperature': temps,
-                'humidity': humidities,
-                'pressure': pressures
-            })
-            
-            # Sort by date (oldest first)
-            df = df.sort_values('date')
+                'temperature': temps.astype(np.float32),
+                'humidity': humidities.astype(np.float32),
+                'pressure': pressures.astype(np.float32)
+            }, copy=False)
             
             return df
         else:
@@ -168,8 +232,10 @@ class SensorDataManager:
         location = self.api_location or "London,UK"
         
         # Calculate date range
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        # (one clock read, so both ends agree even across midnight)
+        now = datetime.now()
+        end_date = now.strftime("%Y-%m-%d")
+        start_date = (now - timedelta(days=days)).strftime("%Y-%m-%d")
         
         # API endpoint for historical data
         base_url = f"https://weather.visualcrossing.com/VisualCrossingWebServices/rest/services/timeline/{location}/{start_date}/{end_date}"
@@ -183,11 +249,9 @@ class SensorDataManager:
         }
         
         # Make API request
-        response = requests.get(base_url, params=params)
+        data, response = self._cached_get(base_url, params, HISTORY_TTL)
         
-        if response.status_code == 200:
-            data = response.json()
-            
+        if data is not None:
             # Extract daily data
             days_data = data.get('days', [])
             
@@ -206,10 +270,10 @@ class SensorDataManager:
             # Create a DataFrame
             df = pd.DataFrame({
                 'date': pd.to_datetime(dates),
-                'temperature': temps,
-                'humidity': humidities,
-                'pressure': pressures
-            })
+                'temperature': np.array(temps, dtype=np.float32),
+                'humidity': np.array(humidities, dtype=np.float32),
+                'pressure': np.array(pressures, dtype=np.float32)
+            }, copy=False)
             
             return df
         else:
@@ -226,73 +290,74 @@ class SensorDataManager:
             print("ThingSpeak channel ID not found. Using simulated data.")
             return self._generate_simulated_data(days)
         
-        # Calculate start time (in seconds from now)
-        start_time = int((datetime.now() - timedelta(days=days)).timestamp())
+        # Calculate start time (in seconds from now), rounded down to the
+        # cache TTL so repeated calls share a cache entry
+        start_time = int((datetime.now() - timedelta(days=days)).timestamp()) // FEED_TTL * FEED_TTL
         
         # API endpoint
         base_url = f"https://api.thingspeak.com/channels/{channel_id}/feeds.json"
         
-        # Parameters
-        params = {
-            "api_key": self.api_key,
-            "start": start_time,
-            "results": 8000  # Maximum results per request
-        }
+        # One request returns at most 8000 results, so long windows are split
+        # into consecutive shards (the last one open ended, up to now) that are
+        # requested in parallel over the pooled session
+        shard_starts = range(start_time, start_time + max(days, 1) * 86400, THINGSPEAK_SHARD_DAYS * 86400)
+        shard_params = []
+        for i, shard_start in enumerate(shard_starts):
+            params = {
+                "api_key": self.api_key,
+                "start": shard_start,
+                "results": 8000  # Maximum results per request
+            }
+            if i < len(shard_starts) - 1:
+                params["end"] = shard_starts[i + 1] - 1
+            shard_params.append(params)
         
-        # Make API request
-        response = requests.get(base_url, params=params)
+        # Make API requests
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(4, len(shard_params))) as executor:
+            results = list(executor.map(lambda params: self._cached_get(base_url, params, FEED_TTL), shard_params))
         
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Extract feeds data
-            feeds = data.get('feeds', [])
+        failed = next((response for data, response in results if data is None), None)
+        if failed is None:
+            # Extract feeds data, oldest shard first
+            feeds = [feed for data, _ in results for feed in data.get('feeds', [])]
             
             if not feeds:
                 print("No data found for the specified time period")
                 return self._generate_simulated_data(days)
                 
-            # Create a DataFrame
-            df = pd.DataFrame(feeds)
-            
-            # Rename columns to match your expected format
-            column_mapping = {
-                'created_at': 'date',
+            # Map ThingSpeak fields to the expected columns
+            field_mapping = {
                 'field1': 'temperature',  # Assuming field1 is temperature
                 'field2': 'humidity',     # Assuming field2 is humidity
                 'field3': 'pressure'      # Assuming field3 is pressure
             }
             
-            # Rename columns that exist
-            for old_col, new_col in column_mapping.items():
-                if old_col in df.columns:
-                    df = df.rename(columns={old_col: new_col})
-            
-            # Convert date to datetime
-            df['date'] = pd.to_datetime(df['date'])
-            
-            # Convert numeric columns to float
-            for col in ['temperature', 'humidity', 'pressure']:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            # Drop unnecessary columns (entry_id and other fields)
-            essential_columns = ['date', 'temperature', 'humidity', 'pressure']
-            df = df[[col for col in essential_columns if col in df.columns]]
+            # Parse the string values straight into typed arrays instead of an
+            # object DataFrame; fields no feed carries are left out
+            columns = {'date': pd.to_datetime([feed.get('created_at') for feed in feeds])}
+            for field, col in field_mapping.items():
+                if any(field in feed for feed in feeds):
+                    columns[col] = np.fromiter((_to_float(feed.get(field)) for feed in feeds),
+                                               dtype=np.float32, count=len(feeds))
+            df = pd.DataFrame(columns, copy=False)
             
             return df
         else:
-            print(f"Error calling ThingSpeak API: {response.status_code} - {response.text}")
+            print(f"Error calling ThingSpeak API: {failed.status_code} - {failed.text}")
             return self._generate_simulated_data(days)
     
     def _read_file_data(self):
         """Read sensor data from a file"""
         try:
-            if os.path.exists(self.data_file):
-                df = pd.read_csv(self.data_file)
-                
-                # Ensure date column is datetime
-                df['date'] = pd.to_datetime(df['date'])
+            if os.path.exists(self.data_file) and self.data_file.endswith('.parquet'):
+                # Parquet keeps the column types, so no parsing is needed
+                return pd.read_parquet(self.data_file)
+            elif os.path.exists(self.data_file):
+                # Explicit dtypes skip type inference and dates are parsed
+                # while reading (repeated values converted once)
+                df = pd.read_csv(self.data_file, engine='c',
+                                 dtype={'temperature': np.float32, 'humidity': np.float32, 'pressure': np.float32},
+                                 parse_dates=['date'], cache_dates=True)
                 
                 return df
             else:
@@ -304,12 +369,17 @@ class SensorDataManager:
             return self._generate_simulated_data()
     
     def save_data_to_file(self, df, file_path=None):
-        """Save sensor data to a CSV file"""
+        """Save sensor data to a CSV file, or a Parquet file if the path ends in .parquet"""
         if file_path is None:
             file_path = self.data_file
             
         try:
-            df.to_csv(file_path, index=False)
+            # Parquet is binary and compressed, far cheaper to write and read
+            # back than formatting every value as text
+            if file_path.endswith('.parquet'):
+                df.to_parquet(file_path, index=False, compression='zstd')
+            else:
+                df.to_csv(file_path, index=False)
             print(f"Data saved to {file_path}")
             return True
         except Exception as e:
@@ -0,0 +1,172 @@
+"""
+Numba kernels for summary statistics over contiguous (rows x metrics) arrays,
+for downsampling time series before they are plotted and for derived weather
+metrics
+"""
+import numpy as np
+from numba import njit, prange
+
+# Row labels of the describe_columns output, matching pandas' DataFrame.describe()
+DESCRIBE_INDEX = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+@njit(cache=True)
+def corr_columns(values):
+    """Pearson correlation between the columns of a 2D array, skipping NaN pairs"""
+    n_rows, n_cols = values.shape
+    result = np.empty((n_cols, n_cols))
+
+    for i in range(n_cols):
+        for j in range(i, n_cols):
+            # First pass: means over rows where both columns are present
+            count = 0
+            sum_i = 0.0
+            sum_j = 0.0
+            for r in range(n_rows):
+                x = values[r, i]
+                y = values[r, j]
+                if not (np.isnan(x) or np.isnan(y)):
+                    count += 1
+                    sum_i += x
+                    sum_j += y
+
+            if count < 2:
+                result[i, j] = np.nan
+                result[j, i] = np.nan
+                continue
+
+            mean_i = sum_i / count
+            mean_j = sum_j / count
+
+            # Second pass: centered cross products
+            cov = 0.0
+            var_i = 0.0
+            var_j = 0.0
+            for r in range(n_rows):
+                x = values[r, i]
+                y = values[r, j]
+                if not (np.isnan(x) or np.isnan(y)):
+                    dx = x - mean_i
+                    dy = y - mean_j
+                    cov += dx * dy
+                    var_i += dx * dx
+                    var_j += dy * dy
+
+            if var_i == 0.0 or var_j == 0.0:
+                corr = np.nan
+            else:
+                corr = cov / np.sqrt(var_i * var_j)
+            result[i, j] = corr
+            result[j, i] = corr
+
+    return result
+
+@njit(cache=True)
+def _quantile(sorted_values, q):
+    """Linearly interpolated quantile of an already sorted 1D array"""
+    position = q * (sorted_values.shape[0] - 1)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, sorted_values.shape[0] - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+@njit(cache=True)
+def describe_columns(values):
+    """count/mean/std/min/25%/50%/75%/max of each column, laid out like DESCRIBE_INDEX"""
+    n_cols = values.shape[1]
+    result = np.full((8, n_cols), np.nan)
+
+    for c in range(n_cols):
+        column = values[:, c]
+        present = np.sort(column[~np.isnan(column)])
+        count = present.shape[0]
+        result[0, c] = count
+
+        if count == 0:
+            continue
+
+        mean = present.mean()
+        result[1, c] = mean
+        if count > 1:
+            result[2, c] = np.sqrt(((present - mean) ** 2).sum() / (count - 1))
+        result[3, c] = present[0]
+        result[4, c] = _quantile(present, 0.25)
+        result[5, c] = _quantile(present, 0.5)
+        result[6, c] = _quantile(present, 0.75)
+        result[7, c] = present[count - 1]
+
+    return result
+
+@njit(cache=True)
+def lttb(x, y, n_out):
+    """Indices of n_out points chosen by Largest-Triangle-Three-Buckets, keeping the series' shape"""
+    n = x.shape[0]
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[n_out - 1] = n - 1
+
+    # Interior points are split into n_out - 2 buckets, one point kept per bucket
+    bucket_size = (n - 2) / (n_out - 2)
+    a = 0
+    for b in range(n_out - 2):
+        start = int(b * bucket_size) + 1
+        end = int((b + 1) * bucket_size) + 1
+
+        # Average of the next bucket (or the last point) is the third triangle corner
+        next_start = end
+        next_end = min(int((b + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            next_start = n - 1
+            next_end = n
+        avg_x = 0.0
+        avg_y = 0.0
+        for r in range(next_start, next_end):
+            avg_x += x[r]
+            avg_y += y[r]
+        avg_x /= next_end - next_start
+        avg_y /= next_end - next_start
+
+        # Keep the point forming the largest triangle with the last kept point
+        ax = float(x[a])
+        ay = float(y[a])
+        best = start
+        best_area = -1.0
+        for r in range(start, end):
+            area = abs((ax - avg_x) * (y[r] - ay) - (ax - x[r]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = r
+
+        selected[b + 1] = best
+        a = best
+
+    return selected
+
+@njit(parallel=True, fastmath={'contract'}, cache=True)
+def heat_index(t, h):
+    """Simplified NWS heat index per reading, rounded to 0.1; below 26 °C it is the temperature itself"""
+    # Constants for the heat index calculation
+    c1 = -8.78469475556
+    c2 = 1.61139411
+    c3 = 2.33854883889
+    c4 = -0.14611605
+    c5 = -0.012308094
+    c6 = -0.0164248277778
+    c7 = 0.002211732
+    c8 = 0.00072546
+    c9 = -0.000003582
+
+    # Only 'contract' is enabled so the polynomial can use FMA while NaN
+    # readings still propagate
+    out = np.empty(t.shape[0])
+    for i in prange(t.shape[0]):
+        ti = t[i]
+        hi = h[i]
+        if ti < 26:
+            out[i] = ti
+        else:
+            out[i] = np.round(c1 + c2*ti + c3*hi + c4*ti*hi + c5*ti*ti + c6*hi*hi
+                              + c7*ti*ti*hi + c8*ti*hi*hi + c9*ti*ti*hi*hi, 1)
+    return out
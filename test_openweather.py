@@ -0,0 +1,51 @@
+"""
+Checks that the comfort level lookup table gives the same levels as classifying each reading
+"""
+import numpy as np
+import pandas as pd
+
+from openweather import OpenWeatherDataManager, COMFORT_LEVELS, _comfort_codes
+
+def baseline_comfort_level(t, h):
+    """Per-reading comfort level as add_weather_metrics classified it before the lookup table"""
+    if t < 15:
+        return "Cold"
+    elif t < 21:
+        return "Cool"
+    elif t < 26:
+        if h < 60:
+            return "Comfortable"
+        else:
+            return "Slightly Humid"
+    elif t < 30:
+        if h < 50:
+            return "Warm"
+        elif h < 70:
+            return "Humid"
+        else:
+            return "Very Humid"
+    else:
+        if h < 50:
+            return "Hot"
+        else:
+            return "Very Hot"
+
+def reading_grid():
+    """Temperatures and humidities across every band edge, out of range values and missing readings"""
+    temperatures = np.concatenate([np.round(np.arange(-20, 70, 0.1), 1), [np.nan]])
+    humidities = np.concatenate([np.round(np.arange(-5, 110, 0.5), 1), [np.nan]])
+    t, h = np.meshgrid(temperatures, humidities, indexing='ij')
+    return pd.DataFrame({'temperature': t.ravel(), 'humidity': h.ravel()})
+
+def test_comfort_level_matches_baseline_branches():
+    df = reading_grid()
+    expected = [baseline_comfort_level(t, h) for t, h in zip(df['temperature'], df['humidity'])]
+    result = OpenWeatherDataManager(api_key="test").add_weather_metrics(df.copy())
+    assert result['comfort_level'].astype(str).tolist() == expected
+
+def test_comfort_level_lookup_matches_thresholds():
+    # Fails if a threshold in _comfort_codes is moved off a whole degree or 10% humidity band edge
+    df = reading_grid()
+    codes = _comfort_codes(df['temperature'].to_numpy(), df['humidity'].to_numpy())
+    result = OpenWeatherDataManager(api_key="test").add_weather_metrics(df.copy())
+    assert result['comfort_level'].astype(str).tolist() == [COMFORT_LEVELS[c] for c in codes]
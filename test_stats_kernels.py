@@ -0,0 +1,84 @@
+"""
+Checks that the Numba kernels in stats_kernels match the pandas/NumPy results they replace
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from stats_kernels import corr_columns, describe_columns, heat_index, lttb, DESCRIBE_INDEX
+
+COLUMNS = ['temperature', 'humidity', 'pressure']
+
+def sensor_frame(rows, seed=0):
+    """Random readings with a few missing values, like the sensor frames the app summarizes"""
+    rng = np.random.default_rng(seed)
+    values = rng.normal([25, 60, 1013], [3, 5, 3], size=(rows, 3))
+    values[rng.random((rows, 3)) < 0.1] = np.nan
+    return pd.DataFrame(values, columns=COLUMNS)
+
+def kernel_describe(df):
+    return pd.DataFrame(describe_columns(df.to_numpy()), index=DESCRIBE_INDEX, columns=df.columns)
+
+@pytest.mark.parametrize('rows', [1, 2, 5, 100])
+def test_describe_matches_pandas(rows):
+    df = sensor_frame(rows)
+    pd.testing.assert_frame_equal(kernel_describe(df), df.describe())
+
+def test_describe_handles_nan_and_single_row_columns():
+    df = pd.DataFrame({
+        'temperature': [np.nan, np.nan, np.nan],
+        'humidity': [np.nan, 61.5, np.nan],
+        'pressure': [1012.0, np.nan, 1014.0],
+    })
+    pd.testing.assert_frame_equal(kernel_describe(df), df.describe())
+
+@pytest.mark.parametrize('rows', [3, 100])
+def test_corr_matches_pandas(rows):
+    df = sensor_frame(rows, seed=1)
+    result = pd.DataFrame(corr_columns(df.to_numpy()), index=df.columns, columns=df.columns)
+    pd.testing.assert_frame_equal(result, df.corr())
+
+def test_corr_of_constant_column_is_nan():
+    df = pd.DataFrame({'temperature': [1.0, 2.0, 3.0], 'humidity': [5.0, 5.0, 5.0]})
+    np.testing.assert_array_equal(np.isnan(corr_columns(df.to_numpy())), df.corr().isna().to_numpy())
+
+@pytest.mark.parametrize('n_out', [3, 10, 500])
+def test_lttb_keeps_endpoints_and_returns_sorted_indices(n_out):
+    x = np.arange(5000, dtype=np.float64)
+    y = np.sin(x / 50) + np.random.default_rng(2).normal(0, 0.1, x.shape[0])
+    idx = lttb(x, y, n_out)
+    assert idx.shape[0] == n_out
+    assert idx[0] == 0 and idx[-1] == x.shape[0] - 1
+    assert np.all(np.diff(idx) > 0)
+
+@pytest.mark.parametrize('n_out', [100, 101, 2])
+def test_lttb_below_threshold_keeps_every_point(n_out):
+    x = np.arange(100, dtype=np.float64)
+    np.testing.assert_array_equal(lttb(x, x * 2, n_out), np.arange(100))
+
+def baseline_heat_index(t, h):
+    """Per-reading heat index as add_weather_metrics computed it before the kernel"""
+    if t < 26:
+        return t
+    c1 = -8.78469475556
+    c2 = 1.61139411
+    c3 = 2.33854883889
+    c4 = -0.14611605
+    c5 = -0.012308094
+    c6 = -0.0164248277778
+    c7 = 0.002211732
+    c8 = 0.00072546
+    c9 = -0.000003582
+    hi = (c1 + c2*t + c3*h + c4*t*h + c5*t**2 + c6*h**2 + c7*t**2*h + c8*t*h**2 + c9*t**2*h**2)
+    return round(hi, 1)
+
+def test_heat_index_matches_baseline_formula():
+    t, h = np.meshgrid(np.arange(-10, 50, 0.37), np.arange(0, 101, 1.3))
+    t = t.ravel()
+    h = h.ravel()
+    expected = np.array([baseline_heat_index(ti, hi) for ti, hi in zip(t, h)])
+    np.testing.assert_allclose(heat_index(t, h), expected, rtol=0, atol=1e-6)
+
+def test_heat_index_propagates_nan():
+    result = heat_index(np.array([np.nan, 30.0]), np.array([50.0, np.nan]))
+    assert np.isnan(result).all()
@@ -1,14 +1,16 @@
 import requests
 import pandas as pd
 from datetime import datetime, timedelta
-import json
+import orjson
 
-def fetch_thingspeak_data(channel_id, read_api_key, days=30):
+def fetch_thingspeak_data(channel_id, read_api_key, days=30, session=None):
     """
     Fetch sensor data from ThingSpeak IoT platform
     
     ThingSpeak is great if you want to connect your own sensors
     (like Arduino, ESP8266, Raspberry Pi) to your dashboard
+    
+    Pass a requests.Session as session to reuse its connections across calls
     """
     # Calculate start time (in seconds from now)
     start_time = int((datetime.now() - timedelta(days=days)).timestamp())
@@ -25,10 +27,10 @@ def fetch_thingspeak_data(channel_id, read_api_key, days=30):
     
     try:
         # Make API request
-        response = requests.get(base_url, params=params)
+        response = (session or requests).get(base_url, params=params)
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             
             # Extract feeds data
             feeds = data.get('feeds', [])
@@ -50,22 +52,19 @@ def fetch_thingspeak_data(channel_id, read_api_key, days=30):
                 'field3': 'pressure'      # Assuming field3 is pressure
             }
             
-            # Rename columns that exist
-            for old_col, new_col in column_mapping.items():
-                if old_col in df.columns:
-                    df = df.rename(columns={old_col: new_col})
+            # Rename columns that exist in one pass (missing ones are ignored)
+            df = df.rename(columns=column_mapping)
             
             # Convert date to datetime
             df['date'] = pd.to_datetime(df['date'])
             
-            # Convert numeric columns to float
-            for col in ['temperature', 'humidity', 'pressure']:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
+            # Convert numeric columns to float in one dispatch
+            numeric_cols = [col for col in ['temperature', 'humidity', 'pressure'] if col in df.columns]
+            df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce', downcast='float')
             
             # Drop unnecessary columns (entry_id and other fields)
             essential_columns = ['date', 'temperature', 'humidity', 'pressure']
-            df = df[[col for col in essential_columns if col in df.columns]]
+            df = df.reindex(columns=[col for col in essential_columns if col in df.columns], copy=False)
             
             return df
         else:
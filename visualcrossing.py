@@ -1,18 +1,24 @@
 import requests
 import pandas as pd
+import numpy as np
+import orjson
 from datetime import datetime, timedelta
 import os
 
-def fetch_visualcrossing_data(api_key, location="London,UK", days=30):
+def fetch_visualcrossing_data(api_key, location="London,UK", days=30, session=None):
     """
     Fetch historical weather data from Visual Crossing Weather API
     
     This API actually provides historical data in the free tier,
     making it a good choice for your dashboard
+    
+    Pass a requests.Session as session to reuse its connections across calls
     """
     # Calculate date range (last X days)
-    end_date = datetime.now().strftime("%Y-%m-%d")
-    start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    # (one clock read, so both ends agree even across midnight)
+    now = datetime.now()
+    end_date = now.strftime("%Y-%m-%d")
+    start_date = (now - timedelta(days=days)).strftime("%Y-%m-%d")
     
     # API endpoint for historical data
     base_url = f"https://weather.visualcrossing.com/VisualCrossingWebServices/rest/services/timeline/{location}/{start_date}/{end_date}"
@@ -27,10 +33,10 @@ def fetch_visualcrossing_data(api_key, location="London,UK", days=30):
     
     try:
         # Make API request
-        response = requests.get(base_url, params=params)
+        response = (session or requests).get(base_url, params=params)
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             
             # Extract daily data
             days_data = data.get('days', [])
@@ -50,10 +56,10 @@ def fetch_visualcrossing_data(api_key, location="London,UK", days=30):
             # Create a DataFrame
             df = pd.DataFrame({
                 'date': pd.to_datetime(dates),
-                'temperature': temps,
-                'humidity': humidities,
-                'pressure': pressures
-            })
+                'temperature': np.array(temps, dtype=np.float32),
+                'humidity': np.array(humidities, dtype=np.float32),
+                'pressure': np.array(pressures, dtype=np.float32)
+            }, copy=False)
             
             return df
         else:
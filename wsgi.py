@@ -4,4 +4,4 @@ from app import app
 server = app.server
 
 if __name__ == "__main__":
-    app.run_server(debug=True) 
\ No newline at end of file
+    app.run(debug=True) 
\ No newline at end of file